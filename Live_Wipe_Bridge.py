@@ -41,6 +41,9 @@ class QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
 class LiveWipeBridge:
     """Bridge zwischen Python und 3D-Visualizer"""
     
+    # Der Visualizer pollt die Statusdatei alle 200 ms; häufigere Writes sieht niemand
+    STATUS_INTERVAL_NS = 200_000_000
+    
     def __init__(self, disk_info: dict):
         self.disk_info = disk_info
         self.status_file = Path.cwd() / 'live_wipe_status.json'
@@ -48,6 +51,8 @@ class LiveWipeBridge:
         self.start_time = None
         self.server_thread = None
         self.server = None
+        self._server_ready = threading.Event()
+        self._last_write_ns = 0
         
         # I/O Tracking mit psutil
         self.last_io_check_time = None
@@ -82,7 +87,7 @@ class LiveWipeBridge:
             'timestamp': datetime.now().isoformat()
         }
         
-        self._write_status()
+        self._write_status(force=True)
         self._init_io_counters()
 
     def _get_physical_disk_name(self, disk_number: int) -> str:
@@ -112,8 +117,15 @@ class LiveWipeBridge:
         """Berechne Sektoren (512 bytes per sector)"""
         return int((size_gb * 1024 * 1024 * 1024) / 512)
     
-    def _write_status(self):
-        """Schreibe Status in JSON-Datei"""
+    def _status_due(self) -> bool:
+        """True, wenn seit dem letzten Schreiben der Statusdatei STATUS_INTERVAL_NS vergangen sind."""
+        return time.monotonic_ns() - self._last_write_ns >= self.STATUS_INTERVAL_NS
+    
+    def _write_status(self, force: bool = False):
+        """Schreibe Status in JSON-Datei (höchstens einmal pro STATUS_INTERVAL_NS, außer force)"""
+        if not force and not self._status_due():
+            return
+        self._last_write_ns = time.monotonic_ns()
         with open(self.status_file, 'w', encoding='utf-8') as f:
             json.dump(self.status, f, indent=2)
     
@@ -134,6 +146,7 @@ class LiveWipeBridge:
                 super().end_headers()
         
         self.server = HTTPServer(('localhost', port), CORSRequestHandler)
+        self._server_ready.set()
         self.server.serve_forever()
     
     def start(self):
@@ -153,7 +166,8 @@ class LiveWipeBridge:
         )
         self.server_thread.start()
         
-        time.sleep(1)
+        # Warten, bis der Server gebunden ist, statt pauschal eine Sekunde zu schlafen
+        self._server_ready.wait(timeout=5)
         
         viz_url = f"http://localhost:{port}/3D_Live_Disk_Wipe_Visualizer.html"
         
@@ -168,7 +182,7 @@ class LiveWipeBridge:
         print("="*60 + "\n")
         
         self.status['wipe']['status'] = 'ready'
-        self._write_status()
+        self._write_status(force=True)
     
     def update_progress(self, wiped_sectors: int, total_sectors: int = None):
         """Update Lösch-Fortschritt"""
@@ -184,6 +198,10 @@ class LiveWipeBridge:
         progress = (wiped_sectors / total * 100) if total > 0 else 0
         self.status['wipe']['progress_percent'] = round(progress, 2)
         
+        # Geschwindigkeit/ETA (inkl. psutil-Abfrage) und Datei nur im Takt des Visualizers aktualisieren
+        if not self._status_due():
+            return
+        
         elapsed_total = time.time() - self.start_time
         self.status['wipe']['elapsed_seconds'] = int(elapsed_total)
         
@@ -229,23 +247,25 @@ class LiveWipeBridge:
                         track: int = None, head: int = None, 
                         pattern: str = None, pass_num: int = None):
         if not self.is_running: return
+        # Neuer Vorgang (z.B. nächster Pass) wird sofort sichtbar, reine Zähler-Updates im Takt
+        changed = bool(operation) and operation != self.status['current_operation']['operation']
         if operation: self.status['current_operation']['operation'] = operation
         if sector is not None: self.status['current_operation']['sector'] = sector
         if track is not None: self.status['current_operation']['track'] = track
         if head is not None: self.status['current_operation']['head'] = head
         if pattern: self.status['current_operation']['pattern'] = pattern
         if pass_num: self.status['current_operation']['pass_number'] = pass_num
-        self._write_status()
+        self._write_status(force=changed)
     
     def set_status(self, status: str):
         self.status['wipe']['status'] = status
-        self._write_status()
+        self._write_status(force=True)
     
     def complete(self, success: bool = True):
         self.status['wipe']['status'] = 'complete' if success else 'failed'
         self.status['wipe']['progress_percent'] = 100.0 if success else self.status['wipe']['progress_percent']
         self.status['wipe']['speed_mbps'] = 0.0
-        self._write_status()
+        self._write_status(force=True)
         
         print("\n" + "="*60)
         print(f"{'✅' if success else '❌'} 3D-Visualizer: Löschvorgang {'abgeschlossen' if success else 'fehlgeschlagen'}")
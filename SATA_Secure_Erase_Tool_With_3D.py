@@ -15,10 +15,11 @@ import time
 from datetime import datetime
 import threading
 import subprocess
+from collections import Counter
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sata_secure_erase import SecureEraser, AdminCheck, DiskDetector, STANDARDS, HTMLReporter
+from sata_secure_erase import SecureEraser, AdminCheck, DiskDetector, HTMLReporter, SUBPROCESS_KWARGS, STANDARDS_LIST, STANDARDS_MENU
 from Live_Wipe_Bridge import LiveWipeBridge
 from core_wiper import CoreWiper
 
@@ -79,11 +80,13 @@ class SecureEraserWith3D(SecureEraser):
             time.sleep(5)
             self.bridge.stop()
         
+        self._close_output()
         return success
 
     def _erase_with_core_wiper(self) -> bool:
         """Standardkonformes Löschen mit Multi-Pass."""
         self.log_event('method', "Verwende standardkonforme CoreWiper-Engine.", 'info')
+        self.erase_method = 'overwrite'
         try:
             with CoreWiper(self.disk_number) as wiper:
                 patterns = self.standard_info['patterns']
@@ -149,7 +152,7 @@ class SecureEraserWith3D(SecureEraser):
 
             def run_diskpart():
                 try:
-                    result = subprocess.run(['diskpart'], input=diskpart_script, capture_output=True, text=True, timeout=estimated_duration_sec * 1.5, encoding='cp850', errors='ignore')
+                    result = subprocess.run(['diskpart'], input=diskpart_script, capture_output=True, text=True, timeout=estimated_duration_sec * 1.5, encoding='cp850', errors='ignore', **SUBPROCESS_KWARGS)
                     process_result['success'] = (result.returncode == 0)
                     if not process_result['success']:
                         process_result['error'] = result.stdout or result.stderr
@@ -183,6 +186,8 @@ class SecureEraserWith3D(SecureEraser):
             thread.join()
 
             if process_result['success']:
+                # Methode erst setzen, wenn diskpart tatsächlich gelöscht hat (sonst bleibt None: nicht gelöscht)
+                self.erase_method = 'diskpart'
                 if self.bridge: self.bridge.update_progress(self.bridge.status['wipe']['total_sectors'])
                 self.log_event('clean', 'Festplatte via `diskpart` bereinigt (1-Pass Nullen).', 'success')
                 return True
@@ -212,26 +217,27 @@ def main_with_3d():
         return
     
     print(f"\n✅ {len(disks)} externe Festplatte(n) gefunden:\n")
-    for idx, disk in enumerate(disks, 1):
-        print(f"   [{idx}] {disk['id']} ({disk.get('model', 'Unknown')}) - {disk.get('size_gb', 'Unknown')} GB")
+    # Gesamte Liste mit einem einzigen Write ausgeben statt einem print() pro Zeile
+    sys.stdout.write("".join(
+        f"   [{idx}] {disk['id']} ({disk.get('model', 'Unknown')}) - {disk.get('size_gb', 'Unknown')} GB\n"
+        for idx, disk in enumerate(disks, 1)
+    ))
     
     print("\n📋 Verfügbare Lösch-Standards:\n")
-    standards_list = list(STANDARDS.items())
-    for idx, (key, info) in enumerate(standards_list, 1):
-        print(f"   [{idx}] {info['name']}")
+    sys.stdout.write(STANDARDS_MENU)
     
     while True:
         try:
-            std_choice = input(f"\nWähle Lösch-Standard [1-{len(standards_list)}]: ").strip() or "1"
+            std_choice = input(f"\nWähle Lösch-Standard [1-{len(STANDARDS_LIST)}]: ").strip() or "1"
             std_idx = int(std_choice) - 1
-            if 0 <= std_idx < len(standards_list):
-                selected_standard = standards_list[std_idx][0]
+            if 0 <= std_idx < len(STANDARDS_LIST):
+                selected_standard, selected_std_info = STANDARDS_LIST[std_idx]
                 break
             print("❌ Ungültige Auswahl!")
         except ValueError:
             print("❌ Bitte eine Zahl eingeben!")
     
-    print(f"\n✅ Standard gewählt: {STANDARDS[selected_standard]['name']}")
+    print(f"\n✅ Standard gewählt: {selected_std_info['name']}")
     
     while True:
         try:
@@ -245,8 +251,7 @@ def main_with_3d():
             print("❌ Ungültige Eingabe!")
     
     print(f"\n⚠️  WARNUNG: Du bist dabei, {len(selected_disks)} Festplatte(n) zu löschen:")
-    for disk in selected_disks:
-        print(f"   • {disk['id']} ({disk.get('size_gb', 'Unknown')} GB)")
+    sys.stdout.write("".join(f"   • {disk['id']} ({disk.get('size_gb', 'Unknown')} GB)\n" for disk in selected_disks))
     
     confirm = input("\n❓ Bist du SICHER? Tippe 'JA LÖSCHEN' zum Bestätigen: ").strip()
     
@@ -271,13 +276,18 @@ def main_with_3d():
         else:
             print(f"\n❌ Fehler beim Löschen von {disk['id']}")
     
+    # Ein Durchlauf über die Ergebnisse für beide Zähler
+    result_counts = Counter(r['success'] for r in erase_results)
+    print(f"\n📊 Zusammenfassung: {result_counts[True]} erfolgreich, {result_counts[False]} fehlgeschlagen ({selected_std_info['name']})")
+    
     print("\n" + "=" * 60 + "\n📄 ERSTELLE HTML-REPORT\n" + "=" * 60 + "\n")
-    report_path = HTMLReporter.generate_report(erase_results)
+    html_path, json_path = HTMLReporter.generate_report(erase_results)
     
     open_report = input("\n💡 Möchtest du den HTML-Report jetzt öffnen? [J/n]: ").strip().upper()
     if open_report != 'N':
         import webbrowser
-        webbrowser.open(str(report_path))
+        # Fertige file://-URL übergeben (as_uri kodiert Laufwerksbuchstaben, Backslashes und Leerzeichen korrekt)
+        webbrowser.open_new_tab(Path(html_path).as_uri())
     
     print("\n✅ Vorgang abgeschlossen.")
     input("\nDrücke ENTER zum Beenden...")
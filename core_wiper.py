@@ -6,9 +6,15 @@ Low-Level Disk Wiping Engine für Sata_Erase
 """
 
 import os
+import errno
+import mmap
 import time
 import sys
 import random
+import threading
+from functools import partial
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 class CoreWiper:
     """
@@ -16,6 +22,8 @@ class CoreWiper:
     """
     
     BUFFER_SIZE = 1024 * 1024  # 1 MB Puffer
+    QUEUE_DEPTH = 8  # Gleichzeitig ausstehende Schreibaufträge (NCQ des Laufwerks auslasten)
+    IOV_COUNT = 4  # Puffer pro Schreibauftrag, per pwritev in einem Syscall geschrieben
     
     def __init__(self, disk_number: int, simulation: bool = False):
         self.disk_number = disk_number
@@ -29,9 +37,21 @@ class CoreWiper:
             
         self.disk_handle = None
         self.total_size = 0
+        self.direct_io = False
+        # Einmal erzeugte Pattern-Puffer, wiederverwendet über alle Pässe und die Verifikation
+        self._pattern_buffers = {}
+        self._random_slots = None
+        self._open_flags = 0
+        # Positionsbasierter Write (data, offset) -> int, pro Pass gesetzt; siehe _execute_pass_queued
+        self._pwrite = None
+        self._worker_local = threading.local()
+        self._worker_handles = []
 
     def __enter__(self):
         """Öffnet das Handle zum physischen Laufwerk."""
+        if self.disk_handle is not None:
+            return self  # Bereits geöffnet (z.B. durch die Zugriffsprüfung), Handle weiterverwenden
+
         if self.simulation:
             self.total_size = 10 * 1024 * 1024 * 1024 # 10 GB Simulation
             return self
@@ -43,7 +63,19 @@ class CoreWiper:
             else:
                 flags = os.O_RDWR | getattr(os, 'O_BINARY', 0)
 
-            self.disk_handle = os.open(self.device_path, flags)
+            # O_DIRECT umgeht den Page-Cache: jeder Block wird nur einmal geschrieben und nie
+            # wieder gelesen, eine zweite Kopie im OS-Puffer ist reine Verschwendung.
+            # (Windows: Raw-Handles auf PhysicalDriveN laufen ohnehin am Cache vorbei.)
+            direct_flag = getattr(os, 'O_DIRECT', 0)
+            try:
+                self.disk_handle = os.open(self.device_path, flags | direct_flag)
+                self.direct_io = bool(direct_flag)
+            except OSError as e:
+                if not direct_flag or e.errno != errno.EINVAL:
+                    raise
+                # Gerät/Dateisystem unterstützt kein O_DIRECT -> gepuffert weiterarbeiten
+                self.disk_handle = os.open(self.device_path, flags)
+            self._open_flags = flags | (direct_flag if self.direct_io else 0)
             
             # Ermittle Größe
             self.total_size = os.lseek(self.disk_handle, 0, os.SEEK_END)
@@ -58,12 +90,44 @@ class CoreWiper:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Schließt das Handle."""
-        if self.disk_handle:
+        if self.disk_handle is not None:
             os.close(self.disk_handle)
             self.disk_handle = None
 
-    def _get_buffer(self, pattern: str) -> bytes:
-        """Erstellt den Schreib-Puffer basierend auf dem Pattern."""
+    @staticmethod
+    def _aligned_buffer(size: int) -> mmap.mmap:
+        """Seitenausgerichteter Puffer (anonymes mmap), Voraussetzung für O_DIRECT."""
+        buffer = mmap.mmap(-1, size)
+        # Transparent Huge Pages anfordern (Linux): ein 4-MiB-Slot braucht dann 2 statt 1024 TLB-Einträge
+        if hasattr(mmap, 'MADV_HUGEPAGE'):
+            try:
+                buffer.madvise(mmap.MADV_HUGEPAGE)
+            except OSError:
+                pass  # THP deaktiviert -> normale Seiten
+        return buffer
+
+    def _get_buffer(self, pattern: str) -> mmap.mmap:
+        """
+        Liefert den ausgerichteten Schreib-Puffer für das Pattern.
+        Feste Patterns werden nur einmal erzeugt; 'random' bekommt immer einen frischen Puffer,
+        da er während des Passes überschrieben wird.
+        """
+        buffer = self._pattern_buffers.get(pattern)
+        if buffer is None:
+            buffer = self._aligned_buffer(self.BUFFER_SIZE)
+            buffer.write(self._pattern_bytes(pattern))
+            if pattern != 'random':
+                self._pattern_buffers[pattern] = buffer
+        return buffer
+
+    def _get_random_slots(self) -> list:
+        """Ausgerichtete Puffer für ausstehende 'random'-Writes (einmal pro Laufwerk angelegt)."""
+        if self._random_slots is None:
+            self._random_slots = [self._aligned_buffer(self.BUFFER_SIZE * self.IOV_COUNT) for _ in range(self.QUEUE_DEPTH)]
+        return self._random_slots
+
+    def _pattern_bytes(self, pattern: str) -> bytes:
+        """Erzeugt den Pufferinhalt für das Pattern."""
         if pattern == 'zeros':
             return b'\x00' * self.BUFFER_SIZE
         elif pattern == 'ones':
@@ -88,59 +152,192 @@ class CoreWiper:
         """
         if self.total_size == 0: return
 
-        buffer = self._get_buffer(pattern)
+        if self.simulation:
+            yield from self._execute_pass_sequential(pattern)
+        else:
+            yield from self._execute_pass_queued(pattern)
+
+    def _open_worker_handle(self):
+        """Initializer der Worker ohne os.pwrite (Windows): jeder Thread bekommt ein eigenes Handle."""
+        fd = os.open(self.device_path, self._open_flags)
+        self._worker_local.fd = fd
+        self._worker_handles.append(fd)
+
+    def _close_worker_handles(self):
+        """Schreibt die Worker-Handles zurück und schließt sie."""
+        while self._worker_handles:
+            fd = self._worker_handles.pop()
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _worker_pwrite(self, data, offset: int) -> int:
+        """pwrite-Ersatz: lseek + write auf dem eigenen Handle des Worker-Threads (keine geteilte Dateiposition)."""
+        fd = self._worker_local.fd
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.write(fd, data)
+
+    def _pwrite_all(self, data, offset: int) -> int:
+        """Schreibt den kompletten Puffer an die Position offset (auch bei Teil-Writes)."""
+        view = memoryview(data)
+        written = 0
+        while written < len(view):
+            written += self._pwrite(view[written:], offset + written)
+        return written
+
+    def _pwritev_all(self, views: list, offset: int) -> int:
+        """Schreibt alle Puffer ab offset mit einem pwritev-Syscall (Fallback: einzeln per pwrite)."""
+        fd = self.disk_handle
+        if not hasattr(os, 'pwritev'):
+            written = 0
+            for view in views:
+                written += self._pwrite_all(view, offset + written)
+            return written
+
+        views = [memoryview(v) for v in views]
+        total = sum(len(v) for v in views)
+        written = 0
+        while written < total:
+            n = os.pwritev(fd, views, offset + written)
+            written += n
+            # Teil-Write: fertige Puffer verwerfen, den angebrochenen kürzen
+            while views and n >= len(views[0]):
+                n -= len(views.pop(0))
+            if n:
+                views[0] = views[0][n:]
+        return written
+
+    def _pwrite_random(self, slot: memoryview, offset: int) -> int:
+        """Füllt den Slot mit Zufallsdaten und schreibt ihn (läuft im Worker-Thread)."""
+        # os.urandom gibt den GIL frei: die Generierung verteilt sich so auf alle Worker
+        slot[:] = os.urandom(len(slot))
+        return self._pwrite_all(slot, offset)
+
+    def _execute_pass_queued(self, pattern: str):
+        """
+        Überschreib-Pass mit bis zu QUEUE_DEPTH gleichzeitig ausstehenden Writes.
+        Positionsbasiertes os.pwrite gibt den GIL frei, so dass das Laufwerk mehrere
+        Aufträge in der Warteschlange hat, statt nach jedem Chunk auf Python zu warten.
+        Jeder Auftrag umfasst IOV_COUNT Chunks; feste Patterns schreiben dabei denselben
+        Puffer mehrfach per pwritev, ohne ihn zu vervielfältigen.
+        Ohne os.pwrite (Windows) schreibt jeder Worker über ein eigenes Handle per lseek + write.
+        Yields: (bytes_written, total_size) einmal pro abgeholtem Batch
+        """
+        is_random = pattern == 'random'
+        # Für 'random' ein ausgerichteter Puffer pro ausstehendem Write; Slot n wird erst
+        # wiederverwendet, nachdem Write n - QUEUE_DEPTH abgeholt wurde
+        slots = self._get_random_slots() if is_random else None
+        buffer = None if is_random else self._get_buffer(pattern)
+        op_size = self.BUFFER_SIZE * self.IOV_COUNT
+        pending = deque()
+        op_index = 0
+        offset = 0
         bytes_written = 0
-        
-        if not self.simulation:
-            os.lseek(self.disk_handle, 0, os.SEEK_SET)
 
-        while bytes_written < self.total_size:
-            # Berechne verbleibende Bytes für den letzten Block
-            remaining = self.total_size - bytes_written
-            current_buffer_size = min(self.BUFFER_SIZE, remaining)
-            
-            if not self.simulation:
-                # Wenn wir am Ende sind und der Puffer kleiner sein muss
-                if current_buffer_size < self.BUFFER_SIZE:
-                    os.write(self.disk_handle, buffer[:current_buffer_size])
-                else:
-                    # Bei 'random' müssen wir jedes Mal neu generieren
-                    if pattern == 'random':
-                        os.write(self.disk_handle, os.urandom(self.BUFFER_SIZE))
+        if hasattr(os, 'pwrite'):
+            self._pwrite = partial(os.pwrite, self.disk_handle)
+            initializer = None
+        else:
+            self._pwrite = self._worker_pwrite
+            initializer = self._open_worker_handle
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.QUEUE_DEPTH, initializer=initializer) as pool:
+                while offset < self.total_size:
+                    size = min(op_size, self.total_size - offset)
+                    # Bei 'random' wird jeder Auftrag im Worker neu generiert, parallel zu den anderen Writes
+                    if is_random:
+                        slot = memoryview(slots[op_index % self.QUEUE_DEPTH])[:size]
+                        pending.append(pool.submit(self._pwrite_random, slot, offset))
                     else:
-                        os.write(self.disk_handle, buffer)
-            else:
-                time.sleep(0.002) # Simulation Speed
+                        full_chunks, tail = divmod(size, self.BUFFER_SIZE)
+                        views = [buffer] * full_chunks
+                        if tail:
+                            views.append(memoryview(buffer)[:tail])
+                        pending.append(pool.submit(self._pwritev_all, views, offset))
+                    op_index += 1
+                    offset += size
+
+                    if len(pending) >= self.QUEUE_DEPTH:
+                        # Ältesten Auftrag abwarten und alle bereits fertigen gleich mit abholen
+                        bytes_written += pending.popleft().result()
+                        while pending and pending[0].done():
+                            bytes_written += pending.popleft().result()
+                        yield bytes_written, self.total_size
+
+                while pending:
+                    bytes_written += pending.popleft().result()
+        finally:
+            self._close_worker_handles()
+
+        # Ein einziger Flush am Ende des Passes statt pro Chunk
+        os.fsync(self.disk_handle)
+        yield bytes_written, self.total_size
 
-            bytes_written += current_buffer_size
+    def _execute_pass_sequential(self, pattern: str):
+        """Simulierter Überschreib-Pass (keine Schreibzugriffe, nur Fortschritt)."""
+        bytes_written = 0
+        while bytes_written < self.total_size:
+            # Letzter Block kann kleiner als BUFFER_SIZE sein
+            bytes_written += min(self.BUFFER_SIZE, self.total_size - bytes_written)
+            time.sleep(0.002) # Simulation Speed
             yield bytes_written, self.total_size
 
+    @staticmethod
+    def _first_mismatch(data, fill: int) -> int:
+        """Index des ersten Bytes in data, das nicht dem Füllbyte entspricht (len(data), falls keines)."""
+        # lstrip läuft in C; nur im Fehlerfall aufgerufen, die Kopie nach bytes fällt daher nicht ins Gewicht
+        return len(data) - len(bytes(data).lstrip(bytes([fill])))
+
     def verify_pass(self, pattern: str):
         """
         Verifiziert den letzten Pass.
-        Yields: (bytes_verified, total_size, success)
+        Yields: (bytes_verified, total_size, success); bei success=False ist bytes_verified der Offset des ersten falschen Bytes
         """
         if self.total_size == 0: return
 
-        expected_buffer = self._get_buffer(pattern)
+        # Referenzblock einmal als bytearray: bytearray == <Puffer> vergleicht per memcmp über das
+        # Buffer-Protokoll, ohne den gelesenen Block erst in ein bytes-Objekt zu kopieren
+        expected_block = bytearray(self._get_buffer(pattern))
+        # Mit O_DIRECT wird vom Datenträger gelesen statt aus dem Page-Cache; das erfordert einen ausgerichteten Zielpuffer.
+        # Ohne O_DIRECT wird (wo readv verfügbar ist) in einen wiederverwendeten Puffer gelesen statt pro Chunk ein bytes-Objekt anzulegen.
+        if self.direct_io:
+            read_buffer = self._aligned_buffer(self.BUFFER_SIZE)
+        elif hasattr(os, 'readv'):
+            read_buffer = bytearray(self.BUFFER_SIZE)
+        else:
+            read_buffer = None
+        # Gelesene Bereiche aus dem Page-Cache werfen, damit die Verifikation großer Laufwerke nicht den RAM füllt
+        drop_cache = not self.direct_io and hasattr(os, 'posix_fadvise')
+        compare = pattern != 'random'
         bytes_verified = 0
         
         if not self.simulation:
             os.lseek(self.disk_handle, 0, os.SEEK_SET)
+            if drop_cache:
+                os.posix_fadvise(self.disk_handle, 0, 0, os.POSIX_FADV_SEQUENTIAL)
 
         while bytes_verified < self.total_size:
             remaining = self.total_size - bytes_verified
             read_size = min(self.BUFFER_SIZE, remaining)
             
             if not self.simulation:
-                data = os.read(self.disk_handle, read_size)
+                if read_buffer is not None:
+                    n = os.readv(self.disk_handle, [memoryview(read_buffer)[:read_size]])
+                    data = memoryview(read_buffer)[:n]
+                else:
+                    data = os.read(self.disk_handle, read_size)
                 
                 # Vergleich (nur bei nicht-random Patterns sinnvoll machbar hier)
-                if pattern != 'random':
-                    expected_chunk = expected_buffer[:read_size]
-                    if data != expected_chunk:
-                        yield bytes_verified, self.total_size, False
+                if compare:
+                    expected_chunk = expected_block if read_size == self.BUFFER_SIZE else expected_block[:read_size]
+                    if expected_chunk != data:
+                        # Exakte Position des ersten abweichenden Bytes statt nur des Chunk-Anfangs melden
+                        yield bytes_verified + self._first_mismatch(data, expected_block[0]), self.total_size, False
                         return
+                if drop_cache:
+                    os.posix_fadvise(self.disk_handle, bytes_verified, read_size, os.POSIX_FADV_DONTNEED)
             else:
                 time.sleep(0.001)
 
@@ -17,10 +17,14 @@ import os
 import sys
 import subprocess
 import ctypes
-import json
 import time
+import threading
+import queue
+import csv
+import html
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from pathlib import Path
+from collections import Counter
 from typing import List, Dict, Optional
 import hashlib
 
@@ -57,15 +61,53 @@ STANDARDS = {
     }
 }
 
+# Auswahlmenü der Standards: beim Import einmal aufgebaut, main() gibt es nur noch aus
+STANDARDS_LIST = list(STANDARDS.items())
+STANDARDS_MENU = "".join(f"   [{idx}] {info['name']}\n" for idx, (key, info) in enumerate(STANDARDS_LIST, 1))
+
+def _iso_hms(timestamp: str) -> str:
+    """HH:MM:SS aus einem datetime.isoformat()-Zeitstempel - per Slicing, ohne datetime zu parsen."""
+    assert timestamp[10:11] == 'T', f"Kein ISO-8601-Zeitstempel: {timestamp!r}"
+    return timestamp[11:19]
+
+# Zeilen der Übersicht pro Festplatte: ein vorkompiliertes Template statt einer f-string-Zeile je Feld
+_SUMMARY_ITEM = '<div class="summary-item"><strong>{label}</strong> {value}</div>'.format_map
+_SUMMARY_ITEMS_SPEC = [
+    ('Startzeit', lambda d: _iso_hms(d['start_time']) if d['start_time'] else 'N/A'),
+    ('Endzeit', lambda d: _iso_hms(d['end_time']) if d['end_time'] else 'N/A'),
+    ('Dauer', lambda d: f"{d['duration_seconds']:.1f}s ({d['duration_seconds']/60:.1f}min)" if d.get('duration_seconds') is not None else "N/A"),
+    ('Standard', lambda d: d['standard_info']['name']),
+    ('Methode', lambda d: ERASE_METHODS.get(d.get('erase_method'), 'N/A')),
+]
+
+# Eine Zeile des Ereignisprotokolls; wird für jeden Log-Eintrag verwendet
+_LOG_ROW = """
+                        <div class="log-entry log-{status}">
+                            <span class="log-timestamp">{ts}</span>
+                            <span>{msg}</span>
+                        </div>
+                    """.format
+
+# Tatsächlich verwendete Löschmethode, wird im Report festgehalten
+ERASE_METHODS = {
+    'overwrite': 'Host-Überschreiben (CoreWiper, Multi-Pass)',
+    'diskpart': 'Windows diskpart "clean all" (1-Pass Nullen)'
+}
+
 class AdminCheck:
     """Prüfung und Anforderung von Administrator-Rechten"""
     
-    @staticmethod
-    def is_admin():
-        try:
-            return ctypes.windll.shell32.IsUserAnAdmin() != 0
-        except:
-            return False
+    # Admin-Status ändert sich während der Laufzeit nicht: einmal abfragen
+    _is_admin_cache: Optional[bool] = None
+    
+    @classmethod
+    def is_admin(cls):
+        if cls._is_admin_cache is None:
+            try:
+                cls._is_admin_cache = ctypes.windll.shell32.IsUserAnAdmin() != 0
+            except:
+                cls._is_admin_cache = False
+        return cls._is_admin_cache
     
     @staticmethod
     def request_admin():
@@ -83,66 +125,262 @@ class AdminCheck:
             input("\nDrücke ENTER zum Beenden...")
             sys.exit(1)
 
+# Serialisiert Konsolenausgaben paralleler Löschvorgänge
+_print_lock = threading.Lock()
+
+# Win32 Konstanten für die Festplatten-Abfrage via DeviceIoControl
+_GENERIC_READ = 0x80000000
+_FILE_SHARE_READ_WRITE = 0x00000001 | 0x00000002
+_OPEN_EXISTING = 3
+_IOCTL_STORAGE_QUERY_PROPERTY = 0x002D1400
+_IOCTL_DISK_GET_LENGTH_INFO = 0x0007405C
+_IOCTL_STORAGE_GET_DEVICE_NUMBER = 0x002D1080
+_BUS_TYPE_USB = 7
+_BUS_TYPES = {_BUS_TYPE_USB: 'USB', 11: 'SATA'}  # STORAGE_BUS_TYPE: BusTypeUsb, BusTypeSata
+_MAX_PHYSICAL_DRIVES = 32
+
+class _StoragePropertyQuery(ctypes.Structure):
+    _fields_ = [
+        ('PropertyId', ctypes.c_uint32),  # StorageDeviceProperty = 0
+        ('QueryType', ctypes.c_uint32),   # PropertyStandardQuery = 0
+        ('AdditionalParameters', ctypes.c_ubyte * 1),
+    ]
+
+class _StorageDeviceNumber(ctypes.Structure):
+    _fields_ = [
+        ('DeviceType', ctypes.c_uint32),
+        ('DeviceNumber', ctypes.c_uint32),
+        ('PartitionNumber', ctypes.c_uint32),
+    ]
+
+class _StorageDeviceDescriptor(ctypes.Structure):
+    _fields_ = [
+        ('Version', ctypes.c_uint32),
+        ('Size', ctypes.c_uint32),
+        ('DeviceType', ctypes.c_ubyte),
+        ('DeviceTypeModifier', ctypes.c_ubyte),
+        ('RemovableMedia', ctypes.c_ubyte),
+        ('CommandQueueing', ctypes.c_ubyte),
+        ('VendorIdOffset', ctypes.c_uint32),
+        ('ProductIdOffset', ctypes.c_uint32),
+        ('ProductRevisionOffset', ctypes.c_uint32),
+        ('SerialNumberOffset', ctypes.c_uint32),
+        ('BusType', ctypes.c_uint32),
+        ('RawPropertiesLength', ctypes.c_uint32),
+    ]
+
+def _hidden_subprocess_kwargs() -> Dict:
+    """Windows: Hilfsprozesse (wmic, diskpart) ohne eigenes Konsolenfenster starten."""
+    if sys.platform != 'win32':
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {'creationflags': subprocess.CREATE_NO_WINDOW, 'startupinfo': startupinfo}
+
+# Einmal gebaut, an jeden subprocess-Aufruf weitergereicht
+SUBPROCESS_KWARGS = _hidden_subprocess_kwargs()
+
+# Abgefragte WMIC-Spalten (Reihenfolge = Entpack-Reihenfolge in _list_disks_wmic)
+_WMIC_COLUMNS = ('DeviceID', 'Index', 'InterfaceType', 'MediaType', 'Model', 'SerialNumber', 'Size')
+
 class DiskDetector:
     """Erkennung und Verwaltung von Festplatten"""
     
+    # Ergebnis der Erkennung, gilt für die gesamte Sitzung
+    _disk_cache: Optional[List[Dict]] = None
+    
+    @classmethod
+    def list_disks(cls, refresh: bool = False) -> List[Dict]:
+        """
+        Liste alle externen physischen Festplatten auf (USB/SATA) und schließt die Boot-Disk aus.
+        refresh=True verwirft das zwischengespeicherte Ergebnis (z.B. nach dem Anstecken eines Laufwerks).
+        """
+        if refresh or cls._disk_cache is None:
+            cls._disk_cache = []
+            # Quellen nach Priorität; die erste, die Laufwerke liefert, gewinnt (keine Zusammenführung nötig)
+            for source in (cls._list_disks_winapi, cls._list_disks_wmic):
+                disks = source()
+                if disks:
+                    cls._disk_cache = disks
+                    break
+        return list(cls._disk_cache)
+    
     @staticmethod
-    def list_disks() -> List[Dict]:
-        """Liste alle externen physischen Festplatten auf (USB/SATA) und schließt die Boot-Disk aus."""
+    def _list_disks_winapi() -> List[Dict]:
+        """Erkennung via CreateFileW + DeviceIoControl ohne externen Prozess (nur Windows)."""
+        if sys.platform != 'win32':
+            return []
+        
+        from ctypes import wintypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.CreateFileW.argtypes = [
+            wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+            wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE
+        ]
+        kernel32.DeviceIoControl.restype = wintypes.BOOL
+        kernel32.DeviceIoControl.argtypes = [
+            wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+            wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID
+        ]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        invalid_handle = wintypes.HANDLE(-1).value
+        
+        def read_string(buffer, offset: int) -> str:
+            if not offset:
+                return ''
+            return ctypes.string_at(ctypes.addressof(buffer) + offset).decode('ascii', errors='ignore').strip()
+        
+        disks = []
+        query = _StoragePropertyQuery(0, 0)
+        returned = wintypes.DWORD()
+        
+        # Physisches Laufwerk des Systemvolumes ermitteln, falls es nicht Index 0 ist
+        system_disk = None
+        system_volume = f"\\\\.\\{os.environ.get('SystemDrive', 'C:')}"
+        handle = kernel32.CreateFileW(system_volume, 0, _FILE_SHARE_READ_WRITE, None, _OPEN_EXISTING, 0, None)
+        if handle is not None and handle != invalid_handle:
+            try:
+                device_number = _StorageDeviceNumber()
+                if kernel32.DeviceIoControl(
+                    handle, _IOCTL_STORAGE_GET_DEVICE_NUMBER, None, 0,
+                    ctypes.byref(device_number), ctypes.sizeof(device_number),
+                    ctypes.byref(returned), None
+                ):
+                    system_disk = device_number.DeviceNumber
+            finally:
+                kernel32.CloseHandle(handle)
+        
+        # Index 0 ist die Boot-Disk und wird nie angeboten
+        for index in range(1, _MAX_PHYSICAL_DRIVES):
+            if index == system_disk:
+                continue
+            device_path = f"\\\\.\\PhysicalDrive{index}"
+            handle = kernel32.CreateFileW(device_path, _GENERIC_READ, _FILE_SHARE_READ_WRITE, None, _OPEN_EXISTING, 0, None)
+            if handle is None or handle == invalid_handle:
+                continue
+            
+            try:
+                descriptor_buffer = ctypes.create_string_buffer(1024)
+                if not kernel32.DeviceIoControl(
+                    handle, _IOCTL_STORAGE_QUERY_PROPERTY,
+                    ctypes.byref(query), ctypes.sizeof(query),
+                    descriptor_buffer, ctypes.sizeof(descriptor_buffer),
+                    ctypes.byref(returned), None
+                ):
+                    continue
+                descriptor = _StorageDeviceDescriptor.from_buffer(descriptor_buffer)
+                
+                bus_type = _BUS_TYPES.get(descriptor.BusType)
+                if bus_type is None:
+                    continue
+                # Nur externe Laufwerke anbieten (wie der WMIC-Filter: USB oder Wechselmedium);
+                # interne SATA-Datenplatten bleiben außen vor
+                if descriptor.BusType != _BUS_TYPE_USB and not descriptor.RemovableMedia:
+                    continue
+                
+                length = ctypes.c_longlong(0)
+                if not kernel32.DeviceIoControl(
+                    handle, _IOCTL_DISK_GET_LENGTH_INFO, None, 0,
+                    ctypes.byref(length), ctypes.sizeof(length),
+                    ctypes.byref(returned), None
+                ):
+                    continue
+                
+                model = " ".join(filter(None, (
+                    read_string(descriptor_buffer, descriptor.VendorIdOffset),
+                    read_string(descriptor_buffer, descriptor.ProductIdOffset)
+                )))
+                serial = read_string(descriptor_buffer, descriptor.SerialNumberOffset)
+                disks.append({
+                    'id': f"Disk {index}",
+                    'number': index,
+                    'model': model if model else 'Unknown',
+                    'serial': serial if serial else 'N/A',
+                    'size_gb': round(length.value / (1024**3), 2),
+                    'bus_type': bus_type,
+                    'path': device_path
+                })
+            finally:
+                kernel32.CloseHandle(handle)
+        
+        return disks
+    
+    @staticmethod
+    def _list_disks_wmic() -> List[Dict]:
+        """Fallback-Erkennung über die WMIC-CSV-Ausgabe."""
         disks = []
         boot_disk_index = "0" 
 
         try:
             cmd = [
                 'wmic', 'diskdrive', 'get', 
-                'DeviceID,Model,Size,SerialNumber,InterfaceType,Index,MediaType', 
+                ','.join(_WMIC_COLUMNS), 
                 '/format:csv'
             ]
-            result = subprocess.run(
+            # Ausgabe zeilenweise lesen statt sie komplett zu puffern und danach zu splitten
+            with subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=10,
                 encoding='utf-8',
-                errors='ignore'
-            )
+                errors='ignore',
+                **SUBPROCESS_KWARGS
+            ) as process:
+                # Zeitlimit während des Streamens durchsetzen: die Iteration über stdout blockiert bis EOF,
+                # ein hängendes WMIC wird deshalb nach 10 s beendet (stdout liefert dann EOF)
+                watchdog = threading.Timer(10, process.kill)
+                watchdog.daemon = True
+                watchdog.start()
+                
+                # csv.reader statt split(','): Modellnamen dürfen Kommas enthalten (in Anführungszeichen)
+                col = None
+                for parts in csv.reader(process.stdout):
+                    if not parts:
+                        continue  # Leerzeilen der WMIC-Ausgabe
+                    parts = [p.strip() for p in parts]
+                    
+                    if col is None:
+                        # Spaltenpositionen einmal aus der Kopfzeile bestimmen
+                        col = {name: parts.index(name) for name in _WMIC_COLUMNS}
+                        continue
+                    if len(parts) < len(col):
+                        continue
+                    
+                    device_id, index, iface_type, media_type, model, serial, size = (parts[col[name]] for name in _WMIC_COLUMNS)
 
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                if len(lines) > 1:
-                    for line in lines[1:]:
-                        parts = [p.strip() for p in line.split(',')]
-                        if not parts or len(parts) < 8:
-                            continue
-                        
-                        node, device_id, index, iface_type, media_type, model, serial, size = parts
+                    if not index or not iface_type:
+                        continue
+                    
+                    if index == boot_disk_index:
+                        continue
 
-                        if not index or not iface_type:
-                            continue
-                        
-                        if index == boot_disk_index:
-                            continue
+                    is_external = (
+                        iface_type.upper() == 'USB' or 
+                        'External' in media_type or 
+                        'Removable' in media_type
+                    )
 
-                        is_external = (
-                            iface_type.upper() == 'USB' or 
-                            'External' in media_type or 
-                            'Removable' in media_type
-                        )
-
-                        if is_external:
-                            try:
-                                size_gb = round(int(size) / (1024**3), 2) if size else 0
-                                disks.append({
-                                    'id': f"Disk {index}",
-                                    'number': int(index),
-                                    'model': model if model else 'Unknown',
-                                    'serial': serial if serial else 'N/A',
-                                    'size_gb': size_gb,
-                                    'bus_type': iface_type,
-                                    'path': device_id
-                                })
-                            except (ValueError, IndexError):
-                                continue
+                    if is_external:
+                        try:
+                            size_gb = round(int(size) / (1024**3), 2) if size else 0
+                            disks.append({
+                                'id': f"Disk {index}",
+                                'number': int(index),
+                                'model': model if model else 'Unknown',
+                                'serial': serial if serial else 'N/A',
+                                'size_gb': size_gb,
+                                'bus_type': iface_type,
+                                'path': device_id
+                            })
+                        except (ValueError, IndexError):
+                            continue
+                
+                watchdog.cancel()
+                if process.wait() != 0:
+                    return []  # Fehler oder durch den Watchdog beendet
         except FileNotFoundError:
             print("⚠️ WMIC.exe nicht gefunden. Festplatten-Erkennung unter Windows nicht möglich.")
         except Exception as e:
@@ -166,7 +404,8 @@ class DiskDetector:
                 text=True,
                 timeout=10,
                 encoding='utf-8',
-                errors='ignore'
+                errors='ignore',
+                **SUBPROCESS_KWARGS
             )
             if result.returncode == 0:
                 for line in result.stdout.split('\n'):
@@ -181,51 +420,175 @@ class DiskDetector:
 class SecureEraser:
     """Kernfunktionalität für sicheres Löschen"""
     
-    def __init__(self, disk_number: int, standard: str = 'BSI_VS_A'):
+    # Verify: Uhr nur bei jedem n-ten 1-MiB-Chunk abfragen (Zweierpotenz, damit die Prüfung ein Bit-AND ist)
+    PROGRESS_CHECK_EVERY = 64
+    # Konsolen-Symbole je Status (einmal pro Klasse statt pro log_event-Aufruf)
+    STATUS_SYMBOLS = {'info': 'ℹ️', 'success': '✅', 'warning': '⚠️', 'error': '❌'}
+    # Maximale Anzahl Log-Zeilen, die der Writer-Thread zu einem stdout-Write zusammenfasst
+    OUTPUT_BATCH = 32
+    
+    def __init__(self, disk_number: int, standard: str = 'BSI_VS_A', parallel: bool = False, journal_path: Optional[str] = None):
+        """journal_path: optionale .jsonl-Datei, in die der Writer-Thread jedes Ereignis sofort mitschreibt."""
+        # Früh abbrechen statt später auf ein falsches Laufwerk zu schreiben; Disk 0 ist die Boot-Disk
+        if isinstance(disk_number, bool) or not isinstance(disk_number, int) or disk_number < 1:
+            raise ValueError(f"Ungültige Festplattennummer: {disk_number!r} (erwartet: Ganzzahl >= 1, Disk 0 ist die Boot-Disk)")
+        if standard not in STANDARDS:
+            raise ValueError(f"Unbekannter Lösch-Standard: {standard!r}")
         self.disk_number = disk_number
         self.disk_id = f"Disk {disk_number}"
         self.standard = standard
         self.standard_info = STANDARDS[standard]
+        self.parallel = parallel  # Läuft gleichzeitig mit anderen Löschvorgängen (Ausgabe mit Disk-Präfix)
         self.log = []
         self.start_time = None
         self.end_time = None
+        self.erase_method = None  # Schlüssel aus ERASE_METHODS
+        self._success = False  # Wird beim erfolgreichen 'complete'-Ereignis gesetzt
+        self._cancelled = threading.Event()
+        # Konsolenausgabe über einen eigenen Writer-Thread (Console-Writes sind unter Windows langsam)
+        self._out_q = queue.Queue()
+        # Protokoll-Journal: bleibt auch erhalten, wenn das Programm vor dem Report abbricht
+        self.journal_path = journal_path
+        self._journal = open(journal_path, 'a', encoding='utf-8') if journal_path else None
+        self._writer = threading.Thread(target=self._drain, daemon=True)
+        self._writer.start()
         
     def log_event(self, event_type: str, message: str, status: str = 'info'):
+        # Nur den rohen Zeitstempel speichern; formatiert wird erst im Report
         entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp_ns': time.time_ns(),
             'type': event_type,
             'message': message,
             'status': status
         }
         self.log.append(entry)
-        symbols = {'info': 'ℹ️', 'success': '✅', 'warning': '⚠️', 'error': '❌'}
-        print(f"{symbols.get(status, 'ℹ️')} {message}")
+        if event_type == 'complete' and status == 'success':
+            self._success = True
+        prefix = f"[{self.disk_id}] " if self.parallel else ""
+        line = f"{prefix}{self.STATUS_SYMBOLS.get(status, 'ℹ️')} {message}"
+        if self._writer is not None:
+            self._out_q.put((line, entry))
+        else:
+            with _print_lock:
+                print(line)
+    
+    def _drain(self):
+        """
+        Writer-Thread: sammelt bis zu OUTPUT_BATCH Ereignisse, schreibt sie mit einem einzigen Write
+        auf die Konsole und hängt sie (falls aktiv) an das Journal an.
+        """
+        import json
+        
+        while True:
+            batch = [self._out_q.get()]
+            while len(batch) < self.OUTPUT_BATCH:
+                try:
+                    batch.append(self._out_q.get_nowait())
+                except queue.Empty:
+                    break
+            done = batch[-1] is None  # Sentinel von _close_output
+            if done:
+                batch.pop()
+            # Fehler beim Ausgeben dürfen den Thread nicht beenden: sonst fehlt task_done()
+            # und jedes spätere _out_q.join() blockiert mitten im Löschvorgang
+            try:
+                if batch:
+                    try:
+                        with _print_lock:
+                            sys.stdout.write("".join(f"{line}\n" for line, _ in batch))
+                            sys.stdout.flush()
+                    except (OSError, ValueError):
+                        pass  # Konsole nicht beschreibbar (z.B. Kodierungsfehler); Protokoll bleibt in self.log
+                    if self._journal is not None:
+                        try:
+                            self._journal.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for _, entry in batch)
+                            self._journal.flush()
+                        except (OSError, ValueError) as e:
+                            # Journal nach dem ersten Fehler abschalten (z.B. Datenträger voll, USB-Stick entfernt)
+                            self._disable_journal(e)
+            finally:
+                for _ in range(len(batch) + done):
+                    self._out_q.task_done()
+            if done:
+                return
     
-    def verify_disk_access(self) -> bool:
-        """Prüfe ob auf Festplatte zugegriffen werden kann"""
+    def _disable_journal(self, error: Exception):
+        """Schließt das Journal nach einem Schreibfehler; der Löschvorgang läuft ohne Journal weiter."""
+        journal, self._journal = self._journal, None
+        try:
+            journal.close()
+        except (OSError, ValueError):
+            pass
+        with _print_lock:
+            print(f"⚠️ [{self.disk_id}] Journal {self.journal_path} deaktiviert: {error}", file=sys.stderr)
+    
+    def _close_output(self):
+        """Beendet den Writer-Thread nach dem Ausgeben aller ausstehenden Zeilen; danach wird direkt gedruckt."""
+        if self._writer is not None:
+            self._out_q.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except (OSError, ValueError):
+                pass
+            self._journal = None
+    
+    def _print_progress(self, text: str):
+        """Fortschrittszeile; parallel als eigene Zeile, damit sich die Disks nicht gegenseitig überschreiben."""
+        # Erst ausstehende Log-Zeilen ausgeben lassen, damit die Reihenfolge erhalten bleibt
+        self._out_q.join()
+        with _print_lock:
+            if self.parallel:
+                print(f"[{self.disk_id}] {text}")
+            else:
+                print(text, end='\r')
+    
+    def cancel(self):
+        """Fordert den Abbruch eines laufenden Löschvorgangs an (z.B. aus dem Hauptthread bei Strg+C)."""
+        self._cancelled.set()
+    
+    def verify_disk_access(self) -> Optional[CoreWiper]:
+        """
+        Prüfe ob auf Festplatte zugegriffen werden kann.
+        Returns: den geöffneten CoreWiper (zur Weiterverwendung) oder None
+        """
         self.log_event('verify', f'Prüfe Zugriff auf {self.disk_id}...', 'info')
         try:
-            with CoreWiper(self.disk_number) as wiper:
-                if wiper.total_size > 0:
-                    self.log_event('verify', f'Festplatten-Zugriff erfolgreich. Größe: {wiper.total_size / (1024**3):.2f} GB', 'success')
-                    return True
-                else:
-                    self.log_event('verify', 'Festplattengröße ist 0.', 'error')
-                    return False
+            wiper = CoreWiper(self.disk_number).__enter__()
         except Exception as e:
             self.log_event('verify', f'Zugriffsfehler: {e}', 'error')
-            return False
+            return None
+        
+        if wiper.total_size > 0:
+            self.log_event('verify', f'Festplatten-Zugriff erfolgreich. Größe: {wiper.total_size / (1024**3):.2f} GB', 'success')
+            return wiper
+        
+        wiper.__exit__(None, None, None)
+        self.log_event('verify', 'Festplattengröße ist 0.', 'error')
+        return None
     
     def perform_erase(self) -> bool:
         """Führe kompletten Löschvorgang durch"""
+        try:
+            return self._run_erase()
+        finally:
+            self._close_output()
+    
+    def _run_erase(self) -> bool:
         self.start_time = datetime.now()
         self.log_event('start', f'Starte Löschvorgang nach {self.standard_info["name"]}', 'info')
         
-        if not self.verify_disk_access():
+        wiper = self.verify_disk_access()
+        if wiper is None:
             return False
         
         try:
-            with CoreWiper(self.disk_number) as wiper:
+            # Handle der Zugriffsprüfung weiterverwenden: kein zweites Öffnen, kein Zeitfenster
+            # in dem ein anderer Prozess das Laufwerk zwischen Prüfung und Löschen belegt
+            with wiper:
+                self.erase_method = 'overwrite'
                 patterns = self.standard_info['patterns']
                 total_passes = len(patterns)
                 
@@ -237,15 +600,21 @@ class SecureEraser:
                     self.log_event('pass_start', f"Starte Pass {pass_num}/{total_passes} mit Pattern '{pattern}'", 'info')
 
                     # Führe den Schreib-Pass durch
-                    last_log_time = time.time()
+                    last_log_time = time.monotonic()
                     for bytes_written, total_size in wiper.execute_pass(pattern):
+                        # Bei jedem Yield prüfen: der Write-Pass liefert nur einen Yield pro 4-32 MiB-Batch,
+                        # eine Zählerschwelle würde Abbruch und Fortschrittsanzeige um Gigabytes verzögern
+                        if self._cancelled.is_set():
+                            raise InterruptedError("Abbruch durch Benutzer")
                         # Fortschrittsanzeige alle 5 Sekunden
-                        if time.time() - last_log_time > 5:
+                        if (now := time.monotonic()) - last_log_time > 5:
                             progress = (bytes_written / total_size) * 100
-                            print(f"   Pass {pass_num}: {progress:.1f}% ({bytes_written / (1024**2):.0f} MB)", end='\r')
-                            last_log_time = time.time()
+                            self._print_progress(f"   Pass {pass_num}: {progress:.1f}% ({bytes_written / (1024**2):.0f} MB)")
+                            last_log_time = now
                     
-                    print("") # Newline nach Progress
+                    if not self.parallel:
+                        self._out_q.join()
+                        print("") # Newline nach Progress
                     self.log_event('pass_end', f"Pass {pass_num}/{total_passes} abgeschlossen.", 'success')
 
                 # Führe Verifizierung durch
@@ -257,19 +626,26 @@ class SecureEraser:
                         self.log_event('verify_start', f"Starte Verifizierung des letzten Passes ('{last_pattern}')...", 'info')
                         verification_ok = True
                         
-                        last_log_time = time.time()
+                        last_log_time = time.monotonic()
+                        chunk_counter = 0
                         for bytes_verified, total_size, is_match in wiper.verify_pass(last_pattern):
                             if not is_match:
                                 self.log_event('verify_fail', f"Verifizierung bei Byte {bytes_verified} fehlgeschlagen!", 'error')
                                 verification_ok = False
                                 break
                             
-                            if time.time() - last_log_time > 5:
-                                progress = (bytes_verified / total_size) * 100
-                                print(f"   Verify: {progress:.1f}%", end='\r')
-                                last_log_time = time.time()
+                            chunk_counter += 1
+                            if chunk_counter & (self.PROGRESS_CHECK_EVERY - 1) == 0:
+                                if self._cancelled.is_set():
+                                    raise InterruptedError("Abbruch durch Benutzer")
+                                if (now := time.monotonic()) - last_log_time > 5:
+                                    progress = (bytes_verified / total_size) * 100
+                                    self._print_progress(f"   Verify: {progress:.1f}%")
+                                    last_log_time = now
                         
-                        print("")
+                        if not self.parallel:
+                            self._out_q.join()
+                            print("")
                         if verification_ok:
                             self.log_event('verify_success', "Verifizierung erfolgreich abgeschlossen.", 'success')
                 
@@ -287,6 +663,17 @@ class SecureEraser:
         if self.start_time and self.end_time:
             duration = (self.end_time - self.start_time).total_seconds()
         
+        # ISO-Zeitstempel erst hier in einem Durchlauf erzeugen (für Report und JSON-Backup); self.log bleibt unverändert
+        log = [
+            {
+                'timestamp': datetime.fromtimestamp(entry['timestamp_ns'] / 1e9).isoformat(),
+                'type': entry['type'],
+                'message': entry['message'],
+                'status': entry['status']
+            }
+            for entry in self.log
+        ]
+        
         return {
             'disk_id': self.disk_id,
             'standard': self.standard,
@@ -294,19 +681,88 @@ class SecureEraser:
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'duration_seconds': duration,
-            'log': self.log,
-            'success': any(e['status'] == 'success' and e['type'] == 'complete' for e in self.log)
+            'erase_method': self.erase_method,
+            'log': log,
+            'success': self._success
         }
 
+# Stylesheet des Reports: einmal beim Import zusammengesetzt statt bei jedem Report neu formatiert
+_BASE_CSS = """
+        body { font-family: 'Segoe UI', sans-serif; background: #f4f7f6; padding: 20px; color: #333; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 10px 40px rgba(0,0,0,0.1); }
+        .header { background: linear-gradient(135deg, #4a00e0 0%, #8e2de2 100%); color: white; padding: 40px; text-align: center; border-top-left-radius: 10px; border-top-right-radius: 10px; }
+        .header h1 { margin-bottom: 10px; }
+        .content { padding: 30px; }
+        .summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 20px; margin-bottom: 30px; }
+        .summary-item { background: #f8f9fa; padding: 20px; border-radius: 8px; border-left: 4px solid #8e2de2; }
+        .summary-item strong { display: block; margin-bottom: 5px; color: #4a00e0; }
+        .disk-section { border: 1px solid #e0e0e0; border-radius: 8px; margin-bottom: 30px; overflow: hidden; }
+        .disk-header { display: flex; justify-content: space-between; align-items: center; padding: 20px; background: #f8f9fa; border-bottom: 1px solid #e0e0e0; }
+        .disk-header h3 { color: #4a00e0; }
+        .status-badge { padding: 8px 20px; border-radius: 20px; font-weight: bold; }
+        .status-success { background: #d4edda; color: #155724; }
+        .status-error { background: #f8d7da; color: #721c24; }
+        .log-section { padding: 20px; }
+        .log-entry { padding: 10px; margin-bottom: 8px; border-radius: 5px; display: flex; gap: 15px; align-items: center; }
+        .log-info { background: #e7f3ff; border-left: 3px solid #2196F3; }
+        .log-success { background: #d4edda; border-left: 3px solid #28a745; }
+        .log-warning { background: #fff3cd; border-left: 3px solid #ffc107; }
+        .log-error { background: #f8d7da; border-left: 3px solid #dc3545; }
+        .log-timestamp { font-size: 0.85em; color: #6c757d; min-width: 70px; }
+        .footer { text-align: center; padding: 20px; color: #6c757d; font-size: 0.9em; background: #f8f9fa; border-bottom-left-radius: 10px; border-bottom-right-radius: 10px;}
+        .pdf-btn { position: fixed; bottom: 20px; right: 20px; background: #4a00e0; color: white; border: none; padding: 15px 25px; border-radius: 50px; cursor: pointer; box-shadow: 0 5px 15px rgba(0,0,0,0.2); font-size: 16px; z-index: 100; }
+        .pdf-btn:hover { background: #8e2de2; }
+"""
+_AUDIT_CSS = ComplianceAuditor.get_audit_styles_css()
+_STYLE_BLOCK = f"<style>{_BASE_CSS}{_AUDIT_CSS}</style>"
+
 class HTMLReporter:
     """Professionelles HTML-Reporting mit Audit-Funktion"""
     
     @staticmethod
     def generate_report(erase_data: List[Dict], output_file: str = None):
+        """
+        Schreibt den HTML-Report und ein JSON-Backup der Rohdaten.
+        Returns: (html_path, json_path)
+        """
         if output_file is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_file = f'Secure_Erase_Report_{timestamp}.html'
+            output_file = f'Secure_Erase_Report_{datetime.now():%Y%m%d_%H%M%S}.html'
+        
+        # Pfade einmalig bilden statt später per with_suffix/str() neu abzuleiten
+        stem = os.path.splitext(os.path.join(os.getcwd(), output_file))[0]
+        html_path, json_path = f"{stem}.html", f"{stem}.json"
+        
+        # Report wird fragmentweise erzeugt und direkt in den Dateipuffer geschrieben,
+        # statt erst ein komplettes HTML-Dokument im Speicher aufzubauen
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.writelines(HTMLReporter._iter_report_chunks(erase_data))
+        
+        # Lazy Import: Frühe Abbrüche in main() (z.B. keine Festplatten) zahlen diese Kosten nicht.
+        # Optional: orjson (deutlich schneller als json.dump mit indent)
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+        
+        if orjson is not None:
+            # orjson liefert direkt UTF-8-Bytes (entspricht ensure_ascii=False)
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(erase_data, option=orjson.OPT_INDENT_2))
+        else:
+            import json
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(erase_data, f, indent=2, ensure_ascii=False)
         
+        print(f"\n📄 HTML-Report erstellt: {html_path}")
+        print(f"💾 JSON-Backup erstellt: {json_path}")
+        return html_path, json_path
+    
+    @staticmethod
+    def _iter_report_chunks(erase_data: List[Dict]):
+        """
+        Erzeugt den HTML-Report als Folge von Fragmenten.
+        Yields: str (Kopf, ein Abschnitt pro Festplatte, Fuß)
+        """
         # PDF Export Skript und Button
         pdf_script = """
         <script src="https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.9.2/html2pdf.bundle.min.js"></script>
@@ -325,41 +781,16 @@ class HTMLReporter:
         </script>
         """
         pdf_button = '<button onclick="exportToPDF()" class="pdf-btn">📄 PDF Export</button>'
+        created_at = datetime.now()  # Einmal für Titel und Kopfzeile, damit beide denselben Zeitpunkt zeigen
 
-        html = f"""<!DOCTYPE html>
+        yield f"""<!DOCTYPE html>
 <html lang="de">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>SATA Secure Erase Report - {datetime.now().strftime('%Y-%m-%d')}</title>
+    <title>SATA Secure Erase Report - {created_at.strftime('%Y-%m-%d')}</title>
     {pdf_script}
-    <style>
-        body {{ font-family: 'Segoe UI', sans-serif; background: #f4f7f6; padding: 20px; color: #333; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 10px 40px rgba(0,0,0,0.1); }}
-        .header {{ background: linear-gradient(135deg, #4a00e0 0%, #8e2de2 100%); color: white; padding: 40px; text-align: center; border-top-left-radius: 10px; border-top-right-radius: 10px; }}
-        .header h1 {{ margin-bottom: 10px; }}
-        .content {{ padding: 30px; }}
-        .summary-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-        .summary-item {{ background: #f8f9fa; padding: 20px; border-radius: 8px; border-left: 4px solid #8e2de2; }}
-        .summary-item strong {{ display: block; margin-bottom: 5px; color: #4a00e0; }}
-        .disk-section {{ border: 1px solid #e0e0e0; border-radius: 8px; margin-bottom: 30px; overflow: hidden; }}
-        .disk-header {{ display: flex; justify-content: space-between; align-items: center; padding: 20px; background: #f8f9fa; border-bottom: 1px solid #e0e0e0; }}
-        .disk-header h3 {{ color: #4a00e0; }}
-        .status-badge {{ padding: 8px 20px; border-radius: 20px; font-weight: bold; }}
-        .status-success {{ background: #d4edda; color: #155724; }}
-        .status-error {{ background: #f8d7da; color: #721c24; }}
-        .log-section {{ padding: 20px; }}
-        .log-entry {{ padding: 10px; margin-bottom: 8px; border-radius: 5px; display: flex; gap: 15px; align-items: center; }}
-        .log-info {{ background: #e7f3ff; border-left: 3px solid #2196F3; }}
-        .log-success {{ background: #d4edda; border-left: 3px solid #28a745; }}
-        .log-warning {{ background: #fff3cd; border-left: 3px solid #ffc107; }}
-        .log-error {{ background: #f8d7da; border-left: 3px solid #dc3545; }}
-        .log-timestamp {{ font-size: 0.85em; color: #6c757d; min-width: 70px; }}
-        .footer {{ text-align: center; padding: 20px; color: #6c757d; font-size: 0.9em; background: #f8f9fa; border-bottom-left-radius: 10px; border-bottom-right-radius: 10px;}}
-        .pdf-btn {{ position: fixed; bottom: 20px; right: 20px; background: #4a00e0; color: white; border: none; padding: 15px 25px; border-radius: 50px; cursor: pointer; box-shadow: 0 5px 15px rgba(0,0,0,0.2); font-size: 16px; z-index: 100; }}
-        .pdf-btn:hover {{ background: #8e2de2; }}
-        {ComplianceAuditor.get_audit_styles_css()}
-    </style>
+    {_STYLE_BLOCK}
 </head>
 <body>
     {pdf_button}
@@ -367,7 +798,7 @@ class HTMLReporter:
         <div class="header">
             <h1>🔒 SATA Secure Erase Report</h1>
             <p>DSGVO-konformes Festplatten-Löschprotokoll (v{VERSION})</p>
-            <p>Erstellt am: {datetime.now().strftime('%d.%m.%Y um %H:%M:%S Uhr')}</p>
+            <p>Erstellt am: {created_at.strftime('%d.%m.%Y um %H:%M:%S Uhr')}</p>
         </div>
         <div class="content">
 """
@@ -375,41 +806,49 @@ class HTMLReporter:
         for idx, data in enumerate(erase_data, 1):
             status_class = 'status-success' if data['success'] else 'status-error'
             status_text = 'Erfolgreich' if data['success'] else 'Fehlgeschlagen'
-            duration_seconds = data.get('duration_seconds')
-            duration_text = f"{duration_seconds:.1f}s ({duration_seconds/60:.1f}min)" if duration_seconds is not None else "N/A"
+            summary_items = "".join(_SUMMARY_ITEM({'label': label, 'value': fn(data)}) for label, fn in _SUMMARY_ITEMS_SPEC)
 
             # Compliance Auditor aufrufen
-            auditor = ComplianceAuditor(data['standard'])
+            # IST-Werte aus dem Protokoll: tatsächlich abgeschlossene Pässe und erfolgreiche Verifikation
+            event_counts = Counter(log['type'] for log in data['log'])
+            if data.get('erase_method') == 'diskpart':
+                # diskpart schreibt genau einen Pass, aber nur wenn `clean all` erfolgreich war
+                passes_executed = sum(1 for log in data['log'] if log['type'] == 'clean' and log['status'] == 'success')
+            else:
+                passes_executed = event_counts['pass_end']
+            auditor = ComplianceAuditor(
+                data['standard'],
+                erase_method=data.get('erase_method'),  # None: es wurde nicht gelöscht
+                passes_executed=passes_executed,
+                verified=event_counts['verify_success'] > 0,
+                verify_failed=event_counts['verify_fail'] > 0
+            )
             audit_html = auditor.generate_audit_html()
 
-            html += f"""
+            yield f"""
             <div class="disk-section">
                 <div class="disk-header">
-                    <h3>Festplatte #{idx}: {data['disk_id']}</h3>
+                    <h3>Festplatte #{idx}: {html.escape(data['disk_id'])}</h3>
                     <span class="status-badge {status_class}">{status_text}</span>
                 </div>
-                <div class="summary-grid" style="padding: 20px;">
-                    <div class="summary-item"><strong>Startzeit</strong> {datetime.fromisoformat(data['start_time']).strftime('%H:%M:%S') if data['start_time'] else 'N/A'}</div>
-                    <div class="summary-item"><strong>Endzeit</strong> {datetime.fromisoformat(data['end_time']).strftime('%H:%M:%S') if data['end_time'] else 'N/A'}</div>
-                    <div class="summary-item"><strong>Dauer</strong> {duration_text}</div>
-                    <div class="summary-item"><strong>Standard</strong> {data['standard_info']['name']}</div>
-                </div>
+                <div class="summary-grid" style="padding: 20px;">{summary_items}</div>
                 
                 {audit_html}
 
                 <div class="log-section">
-                    <h4>📋 Detailliertes Ereignisprotokoll</h4>
-                    {''.join(f'''
-                        <div class="log-entry log-{log['status']}">
-                            <span class="log-timestamp">{datetime.fromisoformat(log['timestamp']).strftime('%H:%M:%S')}</span>
-                            <span>{log['message']}</span>
-                        </div>
-                    ''' for log in data['log'])}
+                    <h4>📋 Detailliertes Ereignisprotokoll</h4>"""
+            
+            # Jede Log-Zeile als eigenes Fragment, statt pro Festplatte einen großen String zu bauen
+            # Meldungen enthalten u.a. Exception-Texte und Gerätenamen: vor dem Einfügen ins HTML escapen
+            for log in data['log']:
+                yield _LOG_ROW(status=html.escape(log['status']), ts=_iso_hms(log['timestamp']), msg=html.escape(log['message']))
+            
+            yield """
                 </div>
             </div>
             """
         
-        html += """
+        yield """
         </div>
         <div class="footer">
             <p><strong>IrsanAI SATA Secure Erase Tool v""" + VERSION + """</strong></p>
@@ -419,13 +858,6 @@ class HTMLReporter:
 </body>
 </html>
 """
-        
-        output_path = Path.cwd() / output_file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print(f"\n📄 HTML-Report erstellt: {output_path}")
-        return output_path
 
 def main():
     print("╔══════════════════════════════════════════════════════════╗")
@@ -445,26 +877,27 @@ def main():
         return
     
     print(f"\n✅ {len(disks)} Festplatte(n) gefunden:\n")
-    for idx, disk in enumerate(disks, 1):
-        print(f"   [{idx}] {disk['id']} ({disk.get('model', 'Unknown')}) - {disk.get('size_gb', 'Unknown')} GB")
+    # Gesamte Liste mit einem einzigen Write ausgeben statt einem print() pro Zeile
+    sys.stdout.write("".join(
+        f"   [{idx}] {disk['id']} ({disk.get('model', 'Unknown')}) - {disk.get('size_gb', 'Unknown')} GB\n"
+        for idx, disk in enumerate(disks, 1)
+    ))
     
     print("\n📋 Verfügbare Lösch-Standards:\n")
-    standards_list = list(STANDARDS.items())
-    for idx, (key, info) in enumerate(standards_list, 1):
-        print(f"   [{idx}] {info['name']}")
+    sys.stdout.write(STANDARDS_MENU)
     
     while True:
         try:
-            std_choice = input(f"\nWähle Lösch-Standard [1-{len(standards_list)}]: ").strip() or "1"
+            std_choice = input(f"\nWähle Lösch-Standard [1-{len(STANDARDS_LIST)}]: ").strip() or "1"
             std_idx = int(std_choice) - 1
-            if 0 <= std_idx < len(standards_list):
-                selected_standard = standards_list[std_idx][0]
+            if 0 <= std_idx < len(STANDARDS_LIST):
+                selected_standard, selected_std_info = STANDARDS_LIST[std_idx]
                 break
             print("❌ Ungültige Auswahl!")
         except ValueError:
             print("❌ Bitte eine Zahl eingeben!")
     
-    print(f"\n✅ Standard gewählt: {STANDARDS[selected_standard]['name']}")
+    print(f"\n✅ Standard gewählt: {selected_std_info['name']}")
     
     while True:
         try:
@@ -478,8 +911,7 @@ def main():
             print("❌ Ungültige Eingabe!")
     
     print(f"\n⚠️  WARNUNG: Du bist dabei, {len(selected_disks)} Festplatte(n) zu löschen:")
-    for disk in selected_disks:
-        print(f"   • {disk['id']} ({disk.get('size_gb', 'Unknown')} GB)")
+    sys.stdout.write("".join(f"   • {disk['id']} ({disk.get('size_gb', 'Unknown')} GB)\n" for disk in selected_disks))
     
     confirm = input("\n❓ Bist du SICHER? Tippe 'JA LÖSCHEN' zum Bestätigen: ").strip()
     
@@ -489,20 +921,48 @@ def main():
     
     print("\n" + "=" * 60 + "\n🚀 STARTE LÖSCHVORGANG\n" + "=" * 60 + "\n")
     
-    erase_results = []
-    for disk in selected_disks:
-        print(f"\n--- Lösche Festplatte: {disk['id']} ---\n")
-        eraser = SecureEraser(disk['number'], selected_standard)
-        eraser.perform_erase()
-        erase_results.append(eraser.get_report_data())
+    # Jede Festplatte hängt an ihrem eigenen Controller-Kanal: alle gleichzeitig löschen
+    parallel = len(selected_disks) > 1
+    run_stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    erasers = [
+        SecureEraser(disk['number'], selected_standard, parallel=parallel,
+                     journal_path=f"Secure_Erase_Journal_Disk{disk['number']}_{run_stamp}.jsonl")
+        for disk in selected_disks
+    ]
+    print(f"\n--- Lösche Festplatte(n): {', '.join(e.disk_id for e in erasers)} ---")
+    print(f"📝 Journal: {', '.join(e.journal_path for e in erasers)}\n")
+    with ThreadPoolExecutor(max_workers=len(erasers)) as pool:
+        futures = {pool.submit(eraser.perform_erase): eraser for eraser in erasers}
+        pending = set(futures)
+        try:
+            # In Abschlussreihenfolge abholen: jede Festplatte meldet sich, sobald sie fertig ist.
+            # Mit Timeout pollen: ein Warten ohne Timeout ist unter Windows nicht per Strg+C unterbrechbar
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ok = future.result()
+                    if parallel:
+                        with _print_lock:
+                            print(f"🏁 {futures[future].disk_id}: {'erfolgreich' if ok else 'fehlgeschlagen'}")
+        except KeyboardInterrupt:
+            for eraser in erasers:
+                eraser.cancel()
+            raise
+    erase_results = [eraser.get_report_data() for eraser in erasers]
+    
+    # Ein Durchlauf über die Ergebnisse für beide Zähler
+    result_counts = Counter(r['success'] for r in erase_results)
+    print(f"\n📊 Zusammenfassung: {result_counts[True]} erfolgreich, {result_counts[False]} fehlgeschlagen ({selected_std_info['name']})")
     
     print("\n" + "=" * 60 + "\n📄 ERSTELLE HTML-REPORT\n" + "=" * 60 + "\n")
-    report_path = HTMLReporter.generate_report(erase_results)
+    html_path, json_path = HTMLReporter.generate_report(erase_results)
     
     open_report = input("\n💡 Möchtest du den HTML-Report jetzt öffnen? [J/n]: ").strip().upper()
     if open_report != 'N':
         import webbrowser
-        webbrowser.open(str(report_path))
+        from pathlib import Path
+        # Fertige file://-URL übergeben (as_uri kodiert Laufwerksbuchstaben, Backslashes und Leerzeichen korrekt)
+        webbrowser.open_new_tab(Path(html_path).as_uri())
     
     print("\n✅ Vorgang abgeschlossen.")
     input("\nDrücke ENTER zum Beenden...")